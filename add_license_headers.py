@@ -7,9 +7,31 @@ Licensed under the MIT License.
 
 import os
 import re
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+import shutil
+import tempfile
 import argparse
+import itertools
+import json
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple, Optional, Pattern
+
+# Shared instrumentation helpers live alongside the other Python scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+
+from instrumentation import add_instrumentation_arguments, instrumented, stage
+
+# Copyright line used by the templates below; --copyright substitutes it when rendering
+DEFAULT_COPYRIGHT = 'Copyright (c) 2025 xDJs LLC'
 
 # License header templates for different file types
 LICENSE_HEADERS = {
@@ -114,10 +136,208 @@ SKIP_FILES = {
     'components.json'
 }
 
+# Number of leading lines searched for an existing license header
+HEADER_SCAN_LINES = 20
+
+# Shape of an existing header block per comment style: (opening line, body line, closing line).
+# Line-comment styles have no distinct closer, so the block ends at the last matching line.
+HEADER_BLOCK_PATTERNS = {
+    'js': (re.compile(r'/\*\*?\s*\Z'), re.compile(r'\s*\*(?!/)'), re.compile(r'\s*\*/\s*\Z')),
+    'css': (re.compile(r'/\*\*?\s*\Z'), re.compile(r'\s*\*(?!/)'), re.compile(r'\s*\*/\s*\Z')),
+    'html': (re.compile(r'<!--\s*\Z'), re.compile(r'(?!.*-->)'), re.compile(r'-->\s*\Z')),
+    'py': (re.compile(r'"""\s*\Z'), re.compile(r'(?!.*""")'), re.compile(r'"""\s*\Z')),
+    'sql': (re.compile(r'--'), re.compile(r'--'), None),
+    'sh': (re.compile(r'#(?!!)'), re.compile(r'#'), None),
+}
+
+# Comment decoration stripped from header lines before their text is inspected
+HEADER_DECORATION = re.compile(r'^\s*(?:/\*+|\*+/?|<!--|-->|"""|--|#)?\s*')
+
+# Text a line inside a license header block may carry
+LICENSE_LINE = re.compile(r'(?:copyright\b|licensed under\b|see license file\b)', re.IGNORECASE)
+
+# Name of the per-directory ignore file honoured while walking
+GITIGNORE_FILE = '.gitignore'
+
+# Processing modes accepted by run_pipeline
+PIPELINE_MODES = ('add', 'update', 'check')
+
+# Files queued per worker ahead of the consumer when processing in parallel
+PIPELINE_QUEUE_PER_JOB = 4
+
+class FileResult(NamedTuple):
+    """Outcome for one file; changed is None when processing raised."""
+    path: Path
+    changed: Optional[bool]
+    message: str
+
+def _translate_gitignore_glob(pattern: str) -> str:
+    """Translate a single gitignore glob into a regular expression body."""
+    parts = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i) and (i == 0 or pattern[i - 1] == '/'):
+                # '**/' matches zero or more directories, a trailing '**' matches everything
+                if pattern.startswith('**/', i):
+                    parts.append('(?:.*/)?')
+                    i += 3
+                else:
+                    parts.append('.*')
+                    i += 2
+                continue
+            parts.append('[^/]*')
+            while i + 1 < n and pattern[i + 1] == '*':
+                i += 1
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            j = i + 1
+            negated = j < n and pattern[j] in '!^'
+            if negated:
+                j += 1
+            members = []
+            # A ']' straight after the opening bracket is a member, not the end of the class
+            if j < n and pattern[j] == ']':
+                members.append('\\]')
+                j += 1
+            while j < n and pattern[j] != ']':
+                if pattern[j] == '\\' and j + 1 < n:
+                    j += 1
+                    members.append(re.escape(pattern[j]))
+                elif pattern[j] in '\\[^':
+                    members.append('\\' + pattern[j])
+                else:
+                    members.append(pattern[j])
+                j += 1
+            if j >= n:
+                # An unterminated class is a literal '['
+                parts.append(re.escape(c))
+            else:
+                parts.append('[' + ('^' if negated else '') + ''.join(members) + ']')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+def compile_gitignore_line(line: str) -> Optional[Tuple[Pattern[str], bool, bool]]:
+    """Compile one .gitignore line into (regex, negated, directory_only), or None if it is blank.
+    
+    Raises re.error for patterns that cannot match anything, such as an inverted range.
+    """
+    line = line.rstrip('\n').rstrip('\r')
+    # Trailing spaces are ignored unless escaped with a backslash
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    if not line or line.startswith('#'):
+        return None
+    
+    negated = False
+    if line.startswith('!'):
+        negated = True
+        line = line[1:]
+    elif line.startswith('\\#') or line.startswith('\\!'):
+        line = line[1:]
+    
+    directory_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    
+    # A slash anywhere but the end anchors the pattern to the .gitignore's directory
+    anchored = '/' in line
+    line = line.lstrip('/')
+    body = _translate_gitignore_glob(line)
+    if not anchored:
+        body = '(?:.*/)?' + body
+    
+    return re.compile(body + r'\Z', re.DOTALL), negated, directory_only
+
+class GitIgnoreMatcher:
+    """Compiled .gitignore rules for a tree, including nested .gitignore files."""
+    
+    def __init__(self, root_dir: Path):
+        self.root_dir = root_dir
+        # Maps a directory (relative to root, '' for the root) to its compiled rules
+        self._rules: Dict[str, List[Tuple[Pattern[str], bool, bool]]] = {}
+        # Per directory, the rules folded into one alternation for files and one for directories
+        self._combined: Dict[str, Tuple[Optional[Tuple[Pattern[str], List[bool]]], ...]] = {}
+    
+    def load(self, directory: Path, force: bool = False, rel_dir: Optional[str] = None) -> None:
+        """Read the .gitignore in a directory, if any, and add its rules."""
+        if rel_dir is None:
+            rel_dir = self._relative(directory)
+        if rel_dir in self._rules and not force:
+            return
+        
+        rules = []
+        try:
+            with open(directory / GITIGNORE_FILE, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rule = compile_gitignore_line(line)
+                    except re.error:
+                        # Like git, a malformed pattern matches nothing rather than aborting the walk
+                        continue
+                    if rule is not None:
+                        rules.append(rule)
+        except (OSError, UnicodeDecodeError):
+            pass
+        self._rules[rel_dir] = rules
+        self._combined[rel_dir] = (self._combine(rules, is_dir=False), self._combine(rules, is_dir=True))
+    
+    @staticmethod
+    def _combine(rules: List[Tuple[Pattern[str], bool, bool]],
+                 is_dir: bool) -> Optional[Tuple[Pattern[str], List[bool]]]:
+        """Fold rules into one regex, last rule first, so the first alternative to match is the one that wins."""
+        selected = [(regex, negated) for regex, negated, directory_only in reversed(rules)
+                    if is_dir or not directory_only]
+        if not selected:
+            return None
+        # Rule bodies only use non-capturing groups, so group n is alternative n
+        combined = re.compile('|'.join(f'({regex.pattern})' for regex, _ in selected), re.DOTALL)
+        return combined, [negated for _, negated in selected]
+    
+    def is_ignored(self, path: Path, is_dir: bool = False, rel_path: Optional[str] = None) -> bool:
+        """Check if a path is ignored by the rules loaded for its ancestors.
+        
+        rel_path is the path relative to the root with '/' separators, when the caller already has it.
+        """
+        if rel_path is None:
+            rel_path = self._relative(path)
+        if not rel_path:
+            return False
+        
+        # Deeper .gitignore files take precedence, and within a file the last match wins
+        end = len(rel_path)
+        while True:
+            slash = rel_path.rfind('/', 0, end)
+            combined = self._combined.get(rel_path[:slash] if slash >= 0 else '')
+            if combined is not None and combined[is_dir] is not None:
+                regex, negated = combined[is_dir]
+                match = regex.match(rel_path, slash + 1)
+                if match:
+                    return not negated[match.lastindex - 1]
+            if slash < 0:
+                return False
+            end = slash
+    
+    def _relative(self, path: Path) -> str:
+        rel_path = os.path.relpath(path, self.root_dir).replace(os.sep, '/')
+        return '' if rel_path == '.' else rel_path
+
 def has_license_header(content: str, file_type: str) -> bool:
     """Check if the file already has a license header."""
-    # Look for copyright notice in the first 20 lines
-    lines = content.split('\n')[:20]
+    # Look for copyright notice in the first HEADER_SCAN_LINES lines
+    lines = content.split('\n')[:HEADER_SCAN_LINES]
     content_start = '\n'.join(lines).lower()
     
     # Check for various forms of copyright notice
@@ -136,29 +356,38 @@ def has_license_header(content: str, file_type: str) -> bool:
 
 def should_skip_file(file_path: Path) -> bool:
     """Check if a file should be skipped."""
-    # Skip if filename is in skip list
-    if file_path.name in SKIP_FILES:
-        return True
-    
     # Skip if any parent directory is in skip list
     for parent in file_path.parents:
         if parent.name in SKIP_DIRS:
             return True
     
+    return _is_skipped_file_name(file_path.name)
+
+def _is_skipped_file_name(name: str) -> bool:
+    """Check if a file should be skipped based on its name alone."""
+    # Skip if filename is in skip list
+    if name in SKIP_FILES:
+        return True
+    
     # Skip if file extension is not supported
-    if file_path.suffix not in FILE_EXTENSIONS:
+    if os.path.splitext(name)[1] not in FILE_EXTENSIONS:
         return True
     
     # Skip test files in some cases (optional)
-    if '.test.' in file_path.name or '.spec.' in file_path.name:
+    if '.test.' in name or '.spec.' in name:
         return True
     
     return False
 
-def add_license_header(file_path: Path, dry_run: bool = False) -> Tuple[bool, str]:
+def render_license_header(file_type: str, notice: str = DEFAULT_COPYRIGHT) -> str:
+    """Render the license header template for a file type with the given copyright line."""
+    return LICENSE_HEADERS[file_type].replace(DEFAULT_COPYRIGHT, notice)
+
+def add_license_header(file_path: Path, dry_run: bool = False,
+                       notice: str = DEFAULT_COPYRIGHT) -> Tuple[bool, str]:
     """Add license header to a file if it doesn't have one."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with stage('read'), open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
     except UnicodeDecodeError:
         return False, f"Skipped (binary file): {file_path}"
@@ -169,11 +398,13 @@ def add_license_header(file_path: Path, dry_run: bool = False) -> Tuple[bool, st
     file_type = FILE_EXTENSIONS.get(file_path.suffix, 'js')
     
     # Check if already has license header
-    if has_license_header(content, file_type):
+    with stage('regex'):
+        licensed = has_license_header(content, file_type)
+    if licensed:
         return False, f"Already has license: {file_path}"
     
     # Get appropriate license header
-    header = LICENSE_HEADERS[file_type]
+    header = render_license_header(file_type, notice)
     
     # Handle shebang lines for shell scripts
     if file_type == 'sh' and content.startswith('#!'):
@@ -193,23 +424,657 @@ def add_license_header(file_path: Path, dry_run: bool = False) -> Tuple[bool, st
     
     # Write the file with license header
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with stage('write'), open(file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
         return True, f"Added license to: {file_path}"
     except Exception as e:
         return False, f"Error writing {file_path}: {e}"
 
-def find_source_files(root_dir: Path) -> List[Path]:
+def check_license_header(file_path: Path) -> Tuple[Optional[bool], str]:
+    """Check a file without modifying it; returns True if the header is missing, None on error."""
+    file_type = FILE_EXTENSIONS.get(file_path.suffix, 'js')
+    try:
+        with stage('read'), open(file_path, 'r', encoding='utf-8') as f:
+            head = ''.join(itertools.islice(f, HEADER_SCAN_LINES))
+    except UnicodeDecodeError:
+        return False, f"Skipped (binary file): {file_path}"
+    except Exception as e:
+        return None, f"Error reading {file_path}: {e}"
+    
+    with stage('regex'):
+        licensed = has_license_header(head, file_type)
+    if licensed:
+        return False, f"Has license: {file_path}"
+    return True, f"Missing license: {file_path}"
+
+def write_check_report(report_path: Path, report_format: str, root_dir: Path, checked: int,
+                       missing: List[Path], errors: List[Tuple[Path, str]]) -> None:
+    """Write the result of a --check run as JSON or JUnit XML."""
+    if report_format == 'json':
+        report = {
+            'root': str(root_dir),
+            'checked': checked,
+            'missing': [path.relative_to(root_dir).as_posix() for path in missing],
+            'errors': [{'path': path.relative_to(root_dir).as_posix(), 'message': message}
+                       for path, message in errors],
+        }
+        report_path.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        return
+    
+    suites = ET.Element('testsuites')
+    suite = ET.SubElement(suites, 'testsuite', name='license-headers', tests=str(checked),
+                          failures=str(len(missing)), errors=str(len(errors)))
+    for path in missing:
+        case = ET.SubElement(suite, 'testcase', classname='license-headers',
+                             name=path.relative_to(root_dir).as_posix())
+        ET.SubElement(case, 'failure', message='Missing license header')
+    for path, message in errors:
+        case = ET.SubElement(suite, 'testcase', classname='license-headers',
+                             name=path.relative_to(root_dir).as_posix())
+        ET.SubElement(case, 'error', message=message)
+    ET.ElementTree(suites).write(report_path, encoding='utf-8', xml_declaration=True)
+
+def find_license_header(lines: List[str], file_type: str) -> Optional[Tuple[int, int]]:
+    """Locate an existing license header block as a [start, end) line range, including its trailing blank line."""
+    opener, body, closer = HEADER_BLOCK_PATTERNS[file_type]
+    start = 1 if lines and lines[0].startswith('#!') else 0
+    if start >= len(lines) or not opener.match(lines[start]):
+        return None
+    
+    end = None
+    if closer is None:
+        end = start + 1
+        while end < len(lines) and body.match(lines[end]):
+            end += 1
+    else:
+        for i in range(start + 1, len(lines)):
+            if closer.match(lines[i]):
+                end = i + 1
+                break
+            if not body.match(lines[i]):
+                return None
+    if end is None:
+        return None
+    
+    # Only treat the block as a license header if every line of text in it is license text,
+    # so module docstrings and ordinary comments that mention a copyright are left alone
+    texts = [HEADER_DECORATION.sub('', line).strip() for line in lines[start:end]]
+    texts = [text for text in texts if text]
+    if not texts or not any(text.lower().startswith('copyright') for text in texts):
+        return None
+    if not all(LICENSE_LINE.match(text) for text in texts):
+        return None
+    
+    if end < len(lines) and not lines[end].strip():
+        end += 1
+    return start, end
+
+def update_license_header(file_path: Path, dry_run: bool = False,
+                          notice: str = DEFAULT_COPYRIGHT) -> Tuple[bool, str]:
+    """Rewrite an existing license header to the current template, adding one if it is missing."""
+    file_type = FILE_EXTENSIONS.get(file_path.suffix, 'js')
+    
+    try:
+        src = open(file_path, 'r', encoding='utf-8', newline='')
+    except Exception as e:
+        return False, f"Error reading {file_path}: {e}"
+    
+    with src:
+        try:
+            with stage('read'):
+                head = list(itertools.islice(src, HEADER_SCAN_LINES))
+        except UnicodeDecodeError:
+            return False, f"Skipped (binary file): {file_path}"
+        except Exception as e:
+            return False, f"Error reading {file_path}: {e}"
+        
+        with stage('regex'):
+            block = find_license_header([line.rstrip('\r\n') for line in head], file_type)
+            licensed = block is None and has_license_header(''.join(head), file_type)
+        if block is None:
+            src.close()
+            if licensed:
+                return False, f"Unrecognised license header, left as is: {file_path}"
+            return add_license_header(file_path, dry_run, notice)
+        
+        start, end = block
+        header = render_license_header(file_type, notice)
+        if start == 1:
+            # The shebang already in the file replaces the one in the template
+            header = header.split('\n', 1)[1] if header.startswith('#!') else header
+        # Render the header with the file's own line endings so CRLF files stay CRLF
+        if head and head[0].endswith('\r\n'):
+            header = header.replace('\n', '\r\n')
+        if ''.join(head[start:end]) == header:
+            return False, f"License header up to date: {file_path}"
+        
+        if dry_run:
+            return True, f"Would update license in: {file_path}"
+        
+        # Write through symlinks to the file they point at
+        real_path = Path(os.path.realpath(file_path))
+        tmp_path = None
+        try:
+            st = os.stat(real_path)
+            if st.st_nlink > 1 or (hasattr(os, 'getuid') and st.st_uid != os.getuid()):
+                # Replacing the inode would split hard links or take over ownership, so rewrite in place
+                with stage('write'):
+                    rest = src.read()
+                    with open(real_path, 'r+', encoding='utf-8', newline='') as dst:
+                        dst.write(''.join(head[:start]))
+                        dst.write(header)
+                        dst.write(''.join(head[end:]))
+                        dst.write(rest)
+                        dst.truncate()
+            else:
+                # Stream the new head and the untouched remainder into a sibling file, then swap it in
+                with stage('write'), tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='',
+                                                                 dir=real_path.parent,
+                                                                 prefix=f'.{real_path.name}.',
+                                                                 delete=False) as dst:
+                    tmp_path = Path(dst.name)
+                    dst.write(''.join(head[:start]))
+                    dst.write(header)
+                    dst.write(''.join(head[end:]))
+                    shutil.copyfileobj(src, dst)
+                shutil.copymode(real_path, tmp_path)
+                os.replace(tmp_path, real_path)
+        except UnicodeDecodeError:
+            return False, f"Skipped (binary file): {file_path}"
+        except Exception as e:
+            return False, f"Error writing {file_path}: {e}"
+        finally:
+            if tmp_path is not None and tmp_path.exists():
+                tmp_path.unlink()
+    
+    return True, f"Updated license in: {file_path}"
+
+def _walk_tree(root_dir: Path, matcher: Optional[GitIgnoreMatcher],
+               enter_dir: Optional[Callable[[Path], bool]] = None) -> Iterator[Tuple[Path, str, List[str]]]:
+    """Walk the tree, pruning skipped and ignored directories, yielding (directory, rel_dir, filenames).
+    
+    rel_dir is the directory relative to the matcher's root with '/' separators ('' for the root).
+    enter_dir is called for each kept subdirectory before it is listed; returning False prunes it.
+    """
+    # Relative paths are carried down from parent to child instead of recomputed per path
+    rel_dirs = {str(root_dir): matcher._relative(root_dir) if matcher is not None else ''}
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        current_dir = Path(dirpath)
+        rel_dir = rel_dirs.pop(dirpath)
+        prefix = rel_dir + '/' if rel_dir else ''
+        # The listing already says whether there is a .gitignore, so most directories need no open()
+        if matcher is not None and GITIGNORE_FILE in filenames:
+            matcher.load(current_dir, rel_dir=rel_dir)
+        
+        # Prune skipped and ignored subtrees in place so os.walk never descends into them
+        kept = []
+        for name in dirnames:
+            child = current_dir / name
+            if _is_skipped_dir(child, matcher, prefix + name):
+                continue
+            if enter_dir is not None and not enter_dir(child):
+                continue
+            kept.append(name)
+            rel_dirs[os.path.join(dirpath, name)] = prefix + name
+        dirnames[:] = kept
+        
+        yield current_dir, rel_dir, filenames
+
+def _is_skipped_dir(dir_path: Path, matcher: Optional[GitIgnoreMatcher],
+                    rel_path: Optional[str] = None) -> bool:
+    """Check if a directory should not be descended into."""
+    if dir_path.name in SKIP_DIRS:
+        return True
+    return matcher is not None and matcher.is_ignored(dir_path, is_dir=True, rel_path=rel_path)
+
+def _is_candidate_file(file_path: Path, matcher: Optional[GitIgnoreMatcher],
+                       rel_path: Optional[str] = None) -> bool:
+    """Check if a file in a walked or watched directory should get a license header.
+    
+    Skipped directories are never walked or watched, so only the file's own name is checked.
+    """
+    if _is_skipped_file_name(file_path.name):
+        return False
+    return not (matcher is not None and matcher.is_ignored(file_path, rel_path=rel_path))
+
+def walk_files(root_dir: Path, matcher: Optional[GitIgnoreMatcher]) -> Iterator[Tuple[Path, str]]:
+    """Pipeline stage: yield (path, rel_path) for every file under non-skipped directories as it is found."""
+    walker = _walk_tree(root_dir, matcher)
+    while True:
+        with stage('walk'):
+            entry = next(walker, None)
+        if entry is None:
+            return
+        current_dir, rel_dir, filenames = entry
+        prefix = rel_dir + '/' if rel_dir else ''
+        for name in filenames:
+            yield current_dir / name, prefix + name
+
+def filter_source_files(entries: Iterable[Tuple[Path, str]],
+                        matcher: Optional[GitIgnoreMatcher]) -> Iterator[Path]:
+    """Pipeline stage: keep only files that should get a license header."""
+    for file_path, rel_path in entries:
+        if _is_candidate_file(file_path, matcher, rel_path):
+            yield file_path
+
+def iter_source_files(root_dir: Path, use_gitignore: bool = True) -> Iterator[Path]:
+    """Lazily yield source code files in walk order."""
+    matcher = GitIgnoreMatcher(root_dir) if use_gitignore else None
+    return filter_source_files(walk_files(root_dir, matcher), matcher)
+
+def find_source_files(root_dir: Path, use_gitignore: bool = True) -> List[Path]:
     """Find all source code files in the directory."""
-    source_files = []
+    return sorted(iter_source_files(root_dir, use_gitignore))
+
+def process_files(paths: Iterable[Path], process: Callable[[Path], Tuple[Optional[bool], str]],
+                  jobs: int = 1) -> Iterator[FileResult]:
+    """Pipeline stage: check and write each file, yielding results in input order."""
+    def run(file_path: Path) -> FileResult:
+        try:
+            changed, message = process(file_path)
+        except Exception as e:
+            return FileResult(file_path, None, f"Error processing {file_path}: {e}")
+        return FileResult(file_path, changed, message)
+    
+    if jobs <= 1:
+        for file_path in paths:
+            yield run(file_path)
+        return
+    
+    # Keep a bounded window of submitted files so the walk is never materialized up front
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        try:
+            for file_path in paths:
+                pending.append(executor.submit(run, file_path))
+                if len(pending) >= jobs * PIPELINE_QUEUE_PER_JOB:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Drop queued work when the consumer stops early
+            for future in pending:
+                future.cancel()
+
+def run_pipeline(root_dir: Path, mode: str = 'add', dry_run: bool = False,
+                 notice: str = DEFAULT_COPYRIGHT, jobs: int = 1,
+                 use_gitignore: bool = True) -> Iterator[FileResult]:
+    """Stream a FileResult for every source file under root_dir: walk, filter, then check/write."""
+    if mode == 'check':
+        process = check_license_header
+    elif mode == 'update':
+        process = partial(update_license_header, dry_run=dry_run, notice=notice)
+    elif mode == 'add':
+        process = partial(add_license_header, dry_run=dry_run, notice=notice)
+    else:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {PIPELINE_MODES}")
+    
+    return process_files(iter_source_files(root_dir, use_gitignore), process, jobs)
+
+class ProgressReporter:
+    """Count results as they stream past and show a live progress line on stderr."""
+    
+    def __init__(self, enabled: bool, interval: float = 0.5):
+        self.enabled = enabled
+        self.interval = interval
+        self.count = 0
+        self.modified = 0
+        self.started = time.monotonic()
+        self._last_draw = self.started
+        self._shown = False
+    
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+    
+    @property
+    def rate(self) -> float:
+        """Files processed per second so far."""
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.0
+    
+    def track(self, results: Iterable[FileResult]) -> Iterator[FileResult]:
+        """Pass results through, redrawing the progress line at most once per interval."""
+        for result in results:
+            self.count += 1
+            if result.changed:
+                self.modified += 1
+            # Clear the progress line so the consumer's output starts on a clean line
+            self._clear()
+            yield result
+            
+            now = time.monotonic()
+            if self.enabled and now - self._last_draw >= self.interval:
+                self._last_draw = now
+                sys.stderr.write(f"\r[{self.count} files, {self.modified} changed, {self.rate:.0f} files/s]")
+                sys.stderr.flush()
+                self._shown = True
+        self._clear()
+    
+    def _clear(self) -> None:
+        if self._shown:
+            sys.stderr.write('\r\033[K')
+            sys.stderr.flush()
+            self._shown = False
+
+# inotify event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+INOTIFY_EVENT = struct.Struct('iIII')
+
+class Inotify:
+    """Minimal ctypes binding to the Linux inotify API."""
+    
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.watches: Dict[int, Path] = {}
+    
+    def add_watch(self, directory: Path, mask: int = WATCH_MASK) -> int:
+        """Watch a directory and return the watch descriptor."""
+        wd = self._add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self.watches[wd] = directory
+        return wd
+    
+    def read_events(self) -> List[Tuple[Path, int]]:
+        """Drain pending events as (path, mask) pairs without blocking."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(buf, offset)
+                offset += INOTIFY_EVENT.size
+                name = buf[offset:offset + length].rstrip(b'\0')
+                offset += length
+                
+                if mask & IN_IGNORED:
+                    # The watched directory was removed or unmounted
+                    self.watches.pop(wd, None)
+                    continue
+                directory = self.watches.get(wd)
+                if directory is None and not mask & IN_Q_OVERFLOW:
+                    continue
+                path = directory / os.fsdecode(name) if directory is not None and name else directory
+                events.append((path, mask))
+        return events
+    
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+def files_open_for_writing(paths: Iterable[Path]) -> Set[Path]:
+    """Return the paths some process currently holds open for writing, according to /proc."""
+    wanted = {os.path.realpath(path): path for path in paths}
+    found: Set[Path] = set()
+    if not wanted:
+        return found
+    
+    try:
+        pids = [name for name in os.listdir('/proc') if name.isdigit()]
+    except OSError:
+        return found
+    
+    for pid in pids:
+        fd_dir = f'/proc/{pid}/fd'
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(f'{fd_dir}/{fd}')
+            except OSError:
+                continue
+            if target not in wanted:
+                continue
+            try:
+                with open(f'/proc/{pid}/fdinfo/{fd}', 'r') as f:
+                    flags = next((int(line.split()[1], 8) for line in f if line.startswith('flags:')), 0)
+            except (OSError, ValueError):
+                # Assume the worst when the flags cannot be read
+                flags = os.O_RDWR
+            if flags & (os.O_WRONLY | os.O_RDWR):
+                found.add(wanted[target])
+    return found
+
+class LicenseHeaderWatcher:
+    """Add license headers to source files as they are created or renamed under a tree."""
+    
+    def __init__(self, root_dir: Path, dry_run: bool = False, use_gitignore: bool = True,
+                 debounce: float = 0.5, notice: str = DEFAULT_COPYRIGHT, update: bool = False):
+        self.root_dir = root_dir
+        self.dry_run = dry_run
+        self.debounce = debounce
+        process = update_license_header if update else add_license_header
+        self.process = partial(process, dry_run=dry_run, notice=notice)
+        self.matcher = GitIgnoreMatcher(root_dir) if use_gitignore else None
+        self.inotify: Optional[Inotify] = None
+        # Maps a complete (closed or renamed into place) new file to the time of its most recent event
+        self.pending: Dict[Path, float] = {}
+        # New files that have been created but not yet closed by their writer
+        self.created: Set[Path] = set()
+    
+    def start(self) -> None:
+        """Open inotify and watch every directory that the scan would walk."""
+        self.inotify = Inotify()
+        self._watch_tree(self.root_dir, queue_files=False)
+    
+    def close(self) -> None:
+        """Stop watching."""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+    
+    def poll(self, timeout: Optional[float]) -> List[Tuple[Path, bool, str]]:
+        """Wait up to timeout for events, then process files that have settled."""
+        readable, _, _ = select.select([self.inotify.fd], [], [], timeout)
+        if readable:
+            for path, mask in self.inotify.read_events():
+                self._handle_event(path, mask)
+        return self._flush(time.monotonic())
+    
+    def next_timeout(self) -> Optional[float]:
+        """Time until the oldest pending file settles, or None to block while idle."""
+        if not self.pending:
+            return None
+        oldest = min(self.pending.values())
+        return max(0.0, oldest + self.debounce - time.monotonic())
+    
+    def run(self, verbose: bool = False) -> None:
+        """Process events until interrupted."""
+        while True:
+            for file_path, changed, message in self.poll(self.next_timeout()):
+                rel_path = file_path.relative_to(self.root_dir)
+                if changed:
+                    print(f"✓ {rel_path}", flush=True)
+                elif verbose:
+                    print(f"- {rel_path} (skipped)", flush=True)
+                if verbose and message:
+                    print(f"  {message}", flush=True)
+    
+    def _watch_tree(self, directory: Path, queue_files: bool) -> None:
+        """Watch a directory and its non-skipped subdirectories."""
+        def add_watch(path: Path) -> bool:
+            # Watching before os.walk lists a directory means nothing created in it can be missed
+            try:
+                self.inotify.add_watch(path)
+            except OSError as e:
+                print(f"✗ Cannot watch {path}: {e}", flush=True)
+                return False
+            return True
+        
+        if not add_watch(directory):
+            return
+        now = time.monotonic()
+        for current_dir, rel_dir, filenames in _walk_tree(directory, self.matcher, enter_dir=add_watch):
+            if queue_files:
+                # Files moved in with a directory produce no events of their own
+                prefix = rel_dir + '/' if rel_dir else ''
+                for name in filenames:
+                    file_path = current_dir / name
+                    if _is_candidate_file(file_path, self.matcher, prefix + name):
+                        self.pending[file_path] = now
+    
+    def _handle_event(self, path: Optional[Path], mask: int) -> None:
+        if mask & IN_Q_OVERFLOW:
+            # Events were dropped, so rescan the whole tree for unlicensed files
+            for file_path in find_source_files(self.root_dir, use_gitignore=self.matcher is not None):
+                self.pending[file_path] = time.monotonic()
+            return
+        
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO) and not _is_skipped_dir(path, self.matcher):
+                self._watch_tree(path, queue_files=True)
+            return
+        
+        if path.name == GITIGNORE_FILE and self.matcher is not None:
+            self.matcher.load(path.parent, force=True)
+            return
+        
+        if mask & IN_CREATE:
+            # Only start tracking; the file becomes eligible once its writer closes it
+            if _is_candidate_file(path, self.matcher):
+                self.created.add(path)
+        elif mask & IN_MOVED_TO:
+            # A rename places a complete file
+            if _is_candidate_file(path, self.matcher):
+                self.created.discard(path)
+                self.pending[path] = time.monotonic()
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            self.created.discard(path)
+            self.pending.pop(path, None)
+        elif mask & IN_CLOSE_WRITE and (path in self.created or path in self.pending):
+            self.created.discard(path)
+            self.pending[path] = time.monotonic()
+        elif mask & IN_MODIFY and path in self.pending:
+            # Reopened and written again, push the deadline back
+            self.pending[path] = time.monotonic()
     
-    for file_path in root_dir.rglob('*'):
-        if file_path.is_file() and not should_skip_file(file_path):
-            source_files.append(file_path)
+    def _flush(self, now: float) -> List[Tuple[Path, bool, str]]:
+        results = []
+        due = [file_path for file_path, last_event in self.pending.items()
+               if now - last_event >= self.debounce]
+        busy = files_open_for_writing(due)
+        for file_path in due:
+            if file_path in busy:
+                # A writer still holds the file open, wait for another quiet period
+                self.pending[file_path] = now
+                continue
+            del self.pending[file_path]
+            if not file_path.is_file():
+                continue
+            changed, message = self.process(file_path)
+            results.append((file_path, changed, message))
+        return results
+
+def watch_directory(root_dir: Path, args: argparse.Namespace) -> int:
+    """Run the watch mode until interrupted."""
+    watcher = LicenseHeaderWatcher(root_dir, dry_run=args.dry_run,
+                                   use_gitignore=not args.no_gitignore,
+                                   debounce=args.debounce, notice=args.copyright,
+                                   update=args.update)
+    try:
+        watcher.start()
+    except OSError as e:
+        print(f"Error: Cannot watch {root_dir}: {e}")
+        return 1
     
-    return sorted(source_files)
+    print(f"Watching directory: {root_dir}")
+    if args.dry_run:
+        print("\n=== DRY RUN MODE ===")
+    
+    try:
+        watcher.run(verbose=args.verbose)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
+    
+    return 0
 
-def main():
+def check_directory(root_dir: Path, results: Iterable[FileResult], args: argparse.Namespace) -> int:
+    """Run the read-only --check mode and return the exit code."""
+    missing: List[Path] = []
+    errors: List[Tuple[Path, str]] = []
+    # With --sort, lines are held back and printed in path order once checking stops
+    lines: List[Tuple[Path, str]] = []
+    checked = 0
+    
+    def emit(file_path: Path, line: str) -> None:
+        if args.sort:
+            lines.append((file_path, line))
+        else:
+            print(line)
+    
+    for file_path, is_missing, message in results:
+        checked += 1
+        rel_path = file_path.relative_to(root_dir)
+        
+        if is_missing is None:
+            errors.append((file_path, message))
+            emit(file_path, f"✗ {message}")
+        elif is_missing:
+            missing.append(file_path)
+            emit(file_path, f"✗ {rel_path} (missing license header)")
+        elif args.verbose:
+            emit(file_path, f"✓ {rel_path}")
+        
+        if args.fail_fast and (missing or errors):
+            # Closing the pipeline cancels any checks still queued
+            break
+    
+    if args.sort:
+        for _, line in sorted(lines, key=lambda entry: entry[0]):
+            print(line)
+        missing.sort()
+        errors.sort()
+    
+    if args.report:
+        write_check_report(Path(args.report), args.report_format, root_dir, checked, missing, errors)
+    
+    if checked == 0:
+        print("No source files found.")
+        return 0
+    
+    print(f"\n=== CHECK SUMMARY ===")
+    print(f"Files checked: {checked}")
+    print(f"Missing license: {len(missing)}")
+    print(f"Errors: {len(errors)}")
+    
+    return 0 if not missing and not errors else 1
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description='Add license headers to source code files')
     parser.add_argument('--dry-run', action='store_true', 
                        help='Show what would be changed without making changes')
@@ -219,9 +1084,49 @@ def main():
                        help='Include test files (.test.* and .spec.*)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Show verbose output')
+    parser.add_argument('--no-gitignore', action='store_true',
+                       help='Do not skip paths matched by .gitignore files')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and add headers to new or renamed files (Linux only); '
+                            'honours --update, --copyright and --dry-run')
+    parser.add_argument('--debounce', type=float, default=0.5,
+                       help='Seconds a new file must be quiet before it is processed in watch mode (default: 0.5)')
+    parser.add_argument('--update', action='store_true',
+                       help='Rewrite existing license headers to the current template and add missing ones')
+    parser.add_argument('--copyright', type=str, default=DEFAULT_COPYRIGHT,
+                       help=f'Copyright line to write (default: "{DEFAULT_COPYRIGHT}")')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Number of files to process in parallel (default: 1)')
+    parser.add_argument('--check', action='store_true',
+                       help='Only report files missing a license header, never modify files; exits 1 if any are found')
+    parser.add_argument('--fail-fast', action='store_true',
+                       help='With --check, stop at the first file missing a header')
+    parser.add_argument('--report', type=str,
+                       help='With --check, write a report of offending paths to this file')
+    parser.add_argument('--report-format', choices=['json', 'junit'], default='json',
+                       help='Format of the --check report (default: json)')
+    parser.add_argument('--sort', action='store_true',
+                       help='Print results in sorted path order (waits for the scan to finish; '
+                            'with --check --fail-fast only the files checked before stopping are sorted)')
+    parser.add_argument('--no-progress', action='store_true',
+                       help='Do not show the live progress line on stderr')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args(argv)
     
-    args = parser.parse_args()
+    if args.watch:
+        # Watch mode only adds or updates headers; the reporting options belong to one-off scans
+        incompatible = [flag for flag, enabled in (('--check', args.check), ('--fail-fast', args.fail_fast),
+                                                   ('--report', args.report), ('--sort', args.sort))
+                        if enabled]
+        if incompatible:
+            parser.error(f"--watch cannot be combined with {', '.join(incompatible)}")
     
+    with instrumented(args, 'add_license_headers'):
+        return run_cli(args)
+
+def run_cli(args: argparse.Namespace) -> int:
+    """Run the command-line tool with parsed arguments."""
     # Modify skip behavior based on arguments
     if args.include_tests:
         # Don't skip test files
@@ -233,16 +1138,21 @@ def main():
         print(f"Error: Directory {root_dir} does not exist")
         return 1
     
-    print(f"Scanning directory: {root_dir}")
+    if args.watch:
+        return watch_directory(root_dir, args)
     
-    # Find all source files
-    source_files = find_source_files(root_dir)
+    print(f"Scanning directory: {root_dir}")
     
-    if not source_files:
-        print("No source files found.")
-        return 0
+    mode = 'check' if args.check else 'update' if args.update else 'add'
+    progress = ProgressReporter(enabled=not args.no_progress and sys.stderr.isatty())
+    results = progress.track(run_pipeline(root_dir, mode, dry_run=args.dry_run, notice=args.copyright,
+                                          jobs=max(1, args.jobs), use_gitignore=not args.no_gitignore))
+    if args.sort and not args.check:
+        # --check sorts its own output so --fail-fast can still stop the scan early
+        results = iter(sorted(results, key=lambda result: result.path))
     
-    print(f"Found {len(source_files)} source files")
+    if args.check:
+        return check_directory(root_dir, results, args)
     
     if args.dry_run:
         print("\n=== DRY RUN MODE ===")
@@ -252,34 +1162,38 @@ def main():
     skipped_count = 0
     error_count = 0
     
-    for file_path in source_files:
-        try:
-            # Make path relative to root for cleaner output
-            rel_path = file_path.relative_to(root_dir)
-            
-            changed, message = add_license_header(file_path, args.dry_run)
-            
-            if changed:
-                modified_count += 1
-                print(f"✓ {rel_path}")
-            else:
-                skipped_count += 1
-                if args.verbose:
-                    print(f"- {rel_path} (skipped)")
-            
-            if args.verbose and message:
-                print(f"  {message}")
-                
-        except Exception as e:
+    for file_path, changed, message in results:
+        # Make path relative to root for cleaner output
+        rel_path = file_path.relative_to(root_dir)
+        
+        if changed is None:
             error_count += 1
-            print(f"✗ Error processing {file_path}: {e}")
+            print(f"✗ {message}")
+            continue
+        
+        if changed:
+            modified_count += 1
+            print(f"✓ {rel_path}")
+        else:
+            skipped_count += 1
+            if args.verbose:
+                print(f"- {rel_path} (skipped)")
+        
+        if args.verbose and message:
+            print(f"  {message}")
+    
+    processed_count = modified_count + skipped_count + error_count
+    if processed_count == 0:
+        print("No source files found.")
+        return 0
     
     # Summary
     print(f"\n=== SUMMARY ===")
-    print(f"Files processed: {len(source_files)}")
+    print(f"Files processed: {processed_count}")
     print(f"Modified: {modified_count}")
     print(f"Skipped: {skipped_count}")
     print(f"Errors: {error_count}")
+    print(f"Throughput: {progress.rate:.0f} files/s ({progress.elapsed:.2f}s)")
     
     if args.dry_run:
         print("\nRun without --dry-run to apply changes.")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark add_license_headers.py against reproducible synthetic repositories.
+Usage: python benchmark_add_license_headers.py --files 5000 --repeat 5 --output bench.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import statistics
+import contextlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add the script directory to the path so we can import the tool
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import add_license_headers
+
+# Source extensions used for generated files, weighted towards a typical Next.js tree
+SOURCE_EXTENSIONS = ['.ts', '.ts', '.tsx', '.tsx', '.js', '.css', '.py', '.sql', '.sh', '.html']
+
+# Line of filler code written into generated source files
+FILLER_LINE = 'export const value{n} = compute({n}, "synthetic benchmark content");\n'
+
+
+def generate_tree(root_dir: Path, files: int = 1000, file_size: int = 2048, depth: int = 4,
+                  node_modules_files: int = 2000, node_modules_depth: int = 6,
+                  binary_files: int = 50, licensed_ratio: float = 0.5, seed: int = 0) -> Dict[str, int]:
+    """Generate a synthetic repository and return counts of what was written."""
+    rng = random.Random(seed)
+    counts = {'source': 0, 'licensed': 0, 'node_modules': 0, 'binary': 0}
+
+    def random_dir(base: Path, max_depth: int) -> Path:
+        parts = [f'd{rng.randrange(8)}' for _ in range(rng.randint(0, max_depth))]
+        return base.joinpath(*parts)
+
+    def source_content(extension: str, n: int, licensed: bool) -> str:
+        file_type = add_license_headers.FILE_EXTENSIONS[extension]
+        body_lines = max(1, file_size // len(FILLER_LINE))
+        body = ''.join(FILLER_LINE.format(n=n + i) for i in range(body_lines))
+        if file_type == 'sh':
+            body = '#!/bin/bash\n' + body
+        if licensed:
+            header = add_license_headers.LICENSE_HEADERS[file_type]
+            if file_type == 'sh':
+                return header + body.split('\n', 1)[1]
+            return header + body
+        return body
+
+    root_dir.mkdir(parents=True, exist_ok=True)
+    (root_dir / '.gitignore').write_text('node_modules/\n', encoding='utf-8')
+
+    for n in range(files):
+        extension = rng.choice(SOURCE_EXTENSIONS)
+        directory = random_dir(root_dir / 'src', depth)
+        directory.mkdir(parents=True, exist_ok=True)
+        licensed = rng.random() < licensed_ratio
+        (directory / f'file{n}{extension}').write_text(source_content(extension, n, licensed), encoding='utf-8')
+        counts['source'] += 1
+        counts['licensed'] += int(licensed)
+
+    for n in range(node_modules_files):
+        directory = random_dir(root_dir / 'node_modules' / f'pkg{rng.randrange(50)}', node_modules_depth)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f'index{n}.js').write_text(FILLER_LINE.format(n=n), encoding='utf-8')
+        counts['node_modules'] += 1
+
+    for n in range(binary_files):
+        # Binary payloads behind source extensions exercise the decode-error path
+        directory = random_dir(root_dir / 'assets', depth)
+        directory.mkdir(parents=True, exist_ok=True)
+        payload = bytes([0xff, 0xfe, 0x00]) + rng.randbytes(max(0, file_size - 3))
+        (directory / f'blob{n}{rng.choice(SOURCE_EXTENSIONS)}').write_bytes(payload)
+        counts['binary'] += 1
+
+    return counts
+
+
+def measure(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], None]] = None,
+            trace_memory: bool = True) -> Dict[str, Any]:
+    """Time func over several runs, then record its peak traced memory in one extra untimed run."""
+    timings = []
+    peak_bytes = None
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+    if trace_memory:
+        # tracemalloc slows allocation down, so it never overlaps a timed run
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'runs': timings,
+        'min_seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'peak_memory_bytes': peak_bytes,
+    }
+
+
+def run_benchmarks(template_dir: Path, work_dir: Path, repeat: int, jobs: int,
+                   trace_memory: bool = True) -> List[Dict[str, Any]]:
+    """Run every benchmark case against copies of the generated tree."""
+    results = []
+
+    def fresh_copy() -> None:
+        if work_dir.exists():
+            shutil.rmtree(work_dir)
+        shutil.copytree(template_dir, work_dir)
+
+    def case(name: str, func: Callable[[], Any], setup: Optional[Callable[[], None]] = None) -> None:
+        result = measure(func, repeat, setup, trace_memory)
+        result['name'] = name
+        results.append(result)
+        print(f"{name:<28} min {result['min_seconds']:.4f}s  median {result['median_seconds']:.4f}s",
+              file=sys.stderr)
+
+    def run_main(*argv: str) -> int:
+        # The progress line is stderr drawing, not work being measured
+        return add_license_headers.main(['-d', str(work_dir), '--no-progress', *argv])
+
+    fresh_copy()
+    case('walk', lambda: add_license_headers.find_source_files(work_dir))
+    case('walk_stream', lambda: sum(1 for _ in add_license_headers.iter_source_files(work_dir)))
+    case('walk_no_gitignore', lambda: add_license_headers.find_source_files(work_dir, use_gitignore=False))
+    case('main_dry_run', lambda: run_main('--dry-run'))
+    case('main_dry_run_sorted', lambda: run_main('--dry-run', '--sort'))
+    case(f'main_dry_run_jobs{jobs}', lambda: run_main('--dry-run', '--jobs', str(jobs)))
+    case('check', lambda: run_main('--check'))
+    case(f'check_jobs{jobs}', lambda: run_main('--check', '--jobs', str(jobs)))
+    case('main', lambda: run_main(), setup=fresh_copy)
+    case(f'main_jobs{jobs}', lambda: run_main('--jobs', str(jobs)), setup=fresh_copy)
+
+    # Incremental: every file already carries a header, so nothing should be written
+    fresh_copy()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_main()
+    case('main_incremental', lambda: run_main())
+    case('update_incremental', lambda: run_main('--update'))
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Benchmark add_license_headers.py on a synthetic tree')
+    parser.add_argument('--files', type=int, default=1000,
+                        help='Number of source files to generate (default: 1000)')
+    parser.add_argument('--file-size', type=int, default=2048,
+                        help='Approximate size of each generated file in bytes (default: 2048)')
+    parser.add_argument('--depth', type=int, default=4,
+                        help='Maximum directory depth for source files (default: 4)')
+    parser.add_argument('--node-modules-files', type=int, default=2000,
+                        help='Number of files to generate under node_modules (default: 2000)')
+    parser.add_argument('--node-modules-depth', type=int, default=6,
+                        help='Maximum directory depth inside node_modules packages (default: 6)')
+    parser.add_argument('--binary-files', type=int, default=50,
+                        help='Number of binary files with source extensions (default: 50)')
+    parser.add_argument('--licensed-ratio', type=float, default=0.5,
+                        help='Fraction of source files that already have a header (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for the generated tree (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per case (default: 3)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 4,
+                        help='Worker count for the parallel cases (default: CPU count)')
+    parser.add_argument('--no-trace-memory', action='store_true',
+                        help='Skip the extra tracemalloc run used to measure peak memory')
+    parser.add_argument('--output', '-o', type=str,
+                        help='Write the JSON report to this file instead of stdout')
+
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='license-bench-') as tmp:
+        template_dir = Path(tmp) / 'template'
+        counts = generate_tree(template_dir, files=args.files, file_size=args.file_size,
+                               depth=args.depth, node_modules_files=args.node_modules_files,
+                               node_modules_depth=args.node_modules_depth,
+                               binary_files=args.binary_files, licensed_ratio=args.licensed_ratio,
+                               seed=args.seed)
+        results = run_benchmarks(template_dir, Path(tmp) / 'work', args.repeat, args.jobs,
+                                 trace_memory=not args.no_trace_memory)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'generated': counts,
+        'results': results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent artistBio requests over HTTP/1.1 connection pools and HTTP/2.
+Usage: python benchmark_artist_bio.py 123 456 --url https://api.musicnerd.xyz --requests 200 --workers 32
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Add the script directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from call_artist_bio import ArtistBioClient
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_case(name: str, client: ArtistBioClient, artist_ids: List[str], requests: int,
+             workers: int) -> Dict[str, Any]:
+    """Send requests across a thread pool sharing one client and summarize latency."""
+    def call(i: int):
+        start = time.perf_counter()
+        result = client.get_artist_bio(artist_ids[i % len(artist_ids)])
+        return time.perf_counter() - start, result is not None
+
+    # The client logs every request verbosely, so discard its output while timing
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(call, range(requests)))
+        wall = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in outcomes]
+    result = {
+        'name': name,
+        'requests': requests,
+        'succeeded': sum(1 for _, ok in outcomes if ok),
+        'wall_seconds': wall,
+        'requests_per_second': requests / wall if wall > 0 else 0.0,
+        'latency_p50_seconds': statistics.median(latencies),
+        'latency_p95_seconds': percentile(latencies, 0.95),
+        'latency_max_seconds': max(latencies),
+    }
+    print(f"{name:<20} {result['requests_per_second']:8.1f} req/s  "
+          f"p50 {result['latency_p50_seconds']:.4f}s  p95 {result['latency_p95_seconds']:.4f}s  "
+          f"ok {result['succeeded']}/{requests}", file=sys.stderr)
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark ArtistBioClient transports under concurrent load"
+    )
+    parser.add_argument("artist_ids", nargs="+",
+                        help="Artist IDs to request, cycled across all requests")
+    parser.add_argument("--url", "-u", default="https://localhost:3000",
+                        help="Base URL of the API (default: https://localhost:3000)")
+    parser.add_argument("--requests", "-n", type=int, default=100,
+                        help="Requests per transport (default: 100)")
+    parser.add_argument("--workers", "-w", type=int, default=32,
+                        help="Concurrent threads sharing one client (default: 32)")
+    parser.add_argument("--pool-block", action="store_true",
+                        help="Block on an exhausted HTTP/1.1 pool instead of opening extra connections")
+    parser.add_argument("--transports", default="http1-default,http1-sized,http2",
+                        help="Comma-separated cases: http1-default (pool of 10), "
+                             "http1-sized (pool sized to --workers), http2 "
+                             "(default: http1-default,http1-sized,http2)")
+    parser.add_argument("--output", "-o",
+                        help="Write the JSON report to this file instead of stdout")
+
+    args = parser.parse_args(argv)
+
+    cases = {
+        'http1-default': dict(pool_block=args.pool_block),
+        'http1-sized': dict(pool_maxsize=args.workers, pool_block=args.pool_block),
+        'http2': dict(pool_maxsize=args.workers, http2=True),
+    }
+
+    results = []
+    for name in [case.strip() for case in args.transports.split(',') if case.strip()]:
+        if name not in cases:
+            parser.error(f"unknown transport {name!r}, expected one of {', '.join(cases)}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            client = ArtistBioClient(base_url=args.url, **cases[name])
+        try:
+            results.append(run_case(name, client, args.artist_ids, args.requests, args.workers))
+        finally:
+            client.session.close()
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'results': results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,33 +4,200 @@ Python script to call the artistBio API endpoint.
 Usage: python call_artist_bio.py <artist_id>
 """
 
+import os
 import sys
+import threading
 import requests
 import json
 import time
 import argparse
-from typing import Optional, Dict, Any
+import contextlib
+from typing import Optional, Dict, Any, Tuple, Union
 from urllib.parse import urljoin
+from requests.adapters import BaseAdapter, HTTPAdapter, DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Shared instrumentation helpers live in the parent scripts directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import add_instrumentation_arguments, instrumented, stage
+
+# HTTP/2 support is optional: pip install 'httpx[http2]'
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that reports TCP connect time to the 'connect' stage."""
+    
+    def connect(self):
+        with stage('connect'):
+            super().connect()
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that reports TCP and TLS handshake time to the 'connect' stage."""
+    
+    def connect(self):
+        with stage('connect'):
+            super().connect()
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Transport adapter whose pools open timed connections."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends requests through an httpx HTTP/2 client.
+    
+    Concurrent requests to the same host are multiplexed over one TLS connection
+    instead of each holding a pooled HTTP/1.1 connection.
+    """
+    
+    def __init__(self, max_connections: int = DEFAULT_POOLSIZE, keep_alive: bool = True):
+        if httpx is None:
+            raise ImportError("HTTP/2 support requires httpx: pip install 'httpx[http2]'")
+        try:
+            # httpx only imports h2 when its first HTTP/2 client is built, so check up front
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError("HTTP/2 support requires h2: pip install 'httpx[http2]'")
+        super().__init__()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections if keep_alive else 0,
+        )
+        self._clients: Dict[Tuple[Any, Any], Any] = {}
+        self._lock = threading.Lock()
+    
+    def _client(self, verify: Union[bool, str], cert: Any):
+        """Return the shared httpx client for a TLS configuration, creating it on first use."""
+        key = (verify, cert)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = httpx.Client(http2=True, limits=self.limits, verify=verify, cert=cert)
+                self._clients[key] = client
+            return client
+    
+    @staticmethod
+    def _timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        client = self._client(verify, cert)
+        connecting = contextlib.ExitStack()
+        
+        def trace(event_name, info):
+            # TCP connect and TLS handshake share the 'connect' stage, as with TimedHTTPSConnection
+            if event_name == 'connection.connect_tcp.started':
+                connecting.enter_context(stage('connect'))
+            elif not event_name.startswith(('connection.connect_tcp.', 'connection.start_tls.')):
+                connecting.close()
+        
+        try:
+            result = client.request(
+                request.method,
+                request.url,
+                headers=dict(request.headers),
+                content=request.body,
+                timeout=self._timeout(timeout),
+                extensions={'trace': trace},
+            )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(e, request=request)
+        finally:
+            connecting.close()
+        
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.reason = result.reason_phrase
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(result.url)
+        response._content = result.content
+        response.request = request
+        response.connection = self
+        return response
+    
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
 
 
 class ArtistBioClient:
     """Client for calling the artistBio API endpoint with verbose logging."""
     
-    def __init__(self, base_url: str = "https://localhost:3000"):
+    def __init__(self, base_url: str = "https://localhost:3000",
+                 pool_connections: int = DEFAULT_POOLSIZE,
+                 pool_maxsize: int = DEFAULT_POOLSIZE,
+                 pool_block: bool = DEFAULT_POOLBLOCK,
+                 keep_alive: bool = True,
+                 http2: bool = False):
         """
         Initialize the client.
         
         Args:
             base_url: Base URL of the API (default: https://localhost:3000)
+            pool_connections: Number of per-host connection pools to cache (default: 10)
+            pool_maxsize: Maximum connections kept per host; size it to the number of
+                threads sharing the client (default: 10)
+            pool_block: Wait for a free connection instead of opening a throwaway
+                one when the pool is exhausted (default: False)
+            keep_alive: Reuse connections between requests (default: True)
+            http2: Send https:// requests over HTTP/2 via httpx (default: False)
         """
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
         
+        # Connection setup is timed separately from waiting on the response
+        adapter = TimedHTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if http2:
+            # HTTP/2 is negotiated over TLS, so plain http:// stays on HTTP/1.1
+            self.session.mount('https://', HTTP2Adapter(max_connections=pool_maxsize,
+                                                        keep_alive=keep_alive))
+        
         # Set default headers
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'ArtistBio-Python-Client/1.0'
         })
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
         
         print(f"[INFO] Initialized client with base URL: {self.base_url}")
     
@@ -55,7 +222,8 @@ class ArtistBioClient:
             start_time = time.time()
             print(f"[INFO] Sending request at {time.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            response = self.session.get(url, timeout=30)
+            with stage('wait'):
+                response = self.session.get(url, timeout=30)
             
             end_time = time.time()
             duration = end_time - start_time
@@ -67,7 +235,8 @@ class ArtistBioClient:
             # Log response content
             if response.headers.get('content-type', '').startswith('application/json'):
                 try:
-                    response_data = response.json()
+                    with stage('decode'):
+                        response_data = response.json()
                     print(f"[INFO] Response JSON:")
                     print(json.dumps(response_data, indent=2, ensure_ascii=False))
                 except json.JSONDecodeError as e:
@@ -146,6 +315,8 @@ Examples:
         help="Enable extra verbose output"
     )
     
+    add_instrumentation_arguments(parser)
+    
     args = parser.parse_args()
     
     print("=" * 60)
@@ -166,7 +337,8 @@ Examples:
     client = ArtistBioClient(base_url=args.url)
     
     try:
-        result = client.get_artist_bio(args.artist_id.strip())
+        with instrumented(args, 'call_artist_bio'):
+            result = client.get_artist_bio(args.artist_id.strip())
         
         print("-" * 60)
         
@@ -4,9 +4,12 @@ Test suite for the call_artist_bio.py script.
 """
 
 import unittest
+import argparse
 import json
 import sys
 import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch, MagicMock
 from io import StringIO
 import requests
@@ -15,7 +18,9 @@ import requests
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import the module under test
-from call_artist_bio import ArtistBioClient, main
+import call_artist_bio
+from call_artist_bio import ArtistBioClient, HTTP2Adapter, main
+from instrumentation import instrumented
 
 
 class TestArtistBioClient(unittest.TestCase):
@@ -50,6 +55,27 @@ class TestArtistBioClient(unittest.TestCase):
         for key, value in expected_headers.items():
             self.assertEqual(self.client.session.headers[key], value)
     
+    def test_pool_options(self):
+        """Test that pool sizing and blocking options reach the HTTP/1.1 adapter."""
+        client = ArtistBioClient("https://api.example.com", pool_connections=4,
+                                 pool_maxsize=64, pool_block=True)
+        adapter = client.session.get_adapter("https://api.example.com/api/artistBio/1")
+        
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertTrue(adapter._pool_block)
+    
+    def test_keep_alive_disabled(self):
+        """Test that disabling keep-alive asks the server to close connections."""
+        client = ArtistBioClient("https://api.example.com", keep_alive=False)
+        self.assertEqual(client.session.headers['Connection'], 'close')
+    
+    @patch('call_artist_bio.httpx', None)
+    def test_http2_requires_httpx(self):
+        """Test that requesting HTTP/2 without httpx installed fails clearly."""
+        with self.assertRaises(ImportError):
+            ArtistBioClient("https://api.example.com", http2=True)
+    
     @patch('call_artist_bio.requests.Session.get')
     def test_successful_bio_retrieval(self, mock_get):
         """Test successful artist bio retrieval."""
@@ -183,6 +209,90 @@ class TestArtistBioClient(unittest.TestCase):
         self.assertEqual(result['message'], 'I am a teapot')
 
 
+@unittest.skipIf(call_artist_bio.httpx is None, "httpx is not installed")
+class TestHTTP2Adapter(unittest.TestCase):
+    """Test cases for the optional HTTP/2 transport."""
+    
+    def setUp(self):
+        """Create an HTTP/2 client whose transport is served by a mock handler."""
+        httpx = call_artist_bio.httpx
+        self.sent = []
+        
+        def handler(request):
+            self.sent.append(request)
+            if request.url.path.endswith('/missing'):
+                return httpx.Response(404, json={'error': 'Artist not found'})
+            if request.url.path.endswith('/down'):
+                raise httpx.ConnectError("Connection refused", request=request)
+            return httpx.Response(200, json={'bio': 'Test artist bio content'})
+        
+        with patch('builtins.print'):
+            self.client = ArtistBioClient("https://api.example.com", http2=True)
+        adapter = self.client.session.get_adapter("https://api.example.com/")
+        self.assertIsInstance(adapter, HTTP2Adapter)
+        mock_client = httpx.Client(transport=httpx.MockTransport(handler))
+        patcher = patch.object(adapter, '_client', return_value=mock_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_successful_bio_retrieval(self):
+        """Test that responses are converted back into requests responses."""
+        with patch('builtins.print'):
+            result = self.client.get_artist_bio("test-artist-123")
+        
+        self.assertEqual(result, {'bio': 'Test artist bio content'})
+        self.assertEqual(self.sent[0].headers['User-Agent'], 'ArtistBio-Python-Client/1.0')
+    
+    def test_status_codes_are_preserved(self):
+        """Test that error statuses flow through the normal handling."""
+        with patch('builtins.print'):
+            result = self.client.get_artist_bio("missing")
+        
+        self.assertIsNone(result)
+    
+    def test_transport_errors_map_to_requests_exceptions(self):
+        """Test that httpx connection errors surface as requests ConnectionError."""
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.session.get("https://api.example.com/api/artistBio/down", timeout=30)
+    
+    def test_missing_h2_fails_at_construction(self):
+        """Test that a missing h2 package is reported when the client is built."""
+        with patch.dict(sys.modules, {'h2': None}), self.assertRaises(ImportError):
+            ArtistBioClient("https://api.example.com", http2=True)
+    
+    def test_connect_stage_is_reported(self):
+        """Test that opening a connection is timed under the shared 'connect' stage."""
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                body = b'{"bio": "ok"}'
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        adapter = HTTP2Adapter()
+        self.addCleanup(adapter.close)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        
+        with instrumented(argparse.Namespace(trace_mem=True), 'test', StringIO()) as timers:
+            response = session.get(f"http://127.0.0.1:{server.server_port}/api/artistBio/1", timeout=5)
+            session.get(f"http://127.0.0.1:{server.server_port}/api/artistBio/2", timeout=5)
+        
+        self.assertEqual(response.json(), {'bio': 'ok'})
+        self.assertEqual(timers.counts[('connect',)], 1)
+
+
 class TestMainFunction(unittest.TestCase):
     """Test cases for the main function and command line interface."""
     
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Shared profiling and instrumentation helpers for the Python scripts.
+Adds --profile/--trace-mem flags, per-stage timers, cProfile output and tracemalloc reports.
+"""
+
+import sys
+import time
+import cProfile
+import pstats
+import argparse
+import threading
+import tracemalloc
+import contextlib
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+# Number of entries shown in the cProfile and tracemalloc summaries
+DEFAULT_TOP = 15
+
+
+class StageTimers:
+    """Accumulate self time per stage; nested stages are keyed by their full stack."""
+
+    def __init__(self):
+        self.totals: Dict[Tuple[str, ...], float] = {}
+        self.counts: Dict[Tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of work under the given stage name."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        # Each frame is [name, time spent in nested stages]
+        stack.append([name, 0.0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            key = tuple(frame[0] for frame in stack)
+            nested = stack.pop()[1]
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                self.totals[key] = self.totals.get(key, 0.0) + elapsed - nested
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def report(self) -> List[str]:
+        """Human-readable lines, largest self time first."""
+        lines = []
+        for key, total in sorted(self.totals.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"  {';'.join(key):<24} {total:10.4f}s  {self.counts[key]:>8} calls")
+        return lines
+
+    def folded(self, root: str) -> List[str]:
+        """Folded stack lines ('root;stage;nested microseconds') for flamegraph.pl or speedscope."""
+        return [f"{';'.join((root,) + key)} {round(total * 1_000_000)}"
+                for key, total in sorted(self.totals.items())]
+
+
+# Timers of the instrumented() block currently running, or None when disabled
+_active_timers: Optional[StageTimers] = None
+
+
+def stage(name: str):
+    """Time a block under a stage name; a no-op unless instrumentation is enabled."""
+    timers = _active_timers
+    if timers is None:
+        return contextlib.nullcontext()
+    return timers.stage(name)
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --profile and --trace-mem flags to a script's parser."""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', metavar='FILE', type=str,
+                       help='Write cProfile stats to FILE and per-stage folded stacks to FILE.folded '
+                            '(cProfile only sees the main thread)')
+    group.add_argument('--trace-mem', action='store_true',
+                       help='Report peak traced memory and the top allocation sites')
+    group.add_argument('--profile-top', type=int, default=DEFAULT_TOP,
+                       help=f'Entries to show in profile and memory summaries (default: {DEFAULT_TOP})')
+
+
+@contextlib.contextmanager
+def instrumented(args: argparse.Namespace, name: str,
+                 stream: Optional[TextIO] = None) -> Iterator[Optional[StageTimers]]:
+    """Enable the instrumentation requested on the command line for the duration of the block."""
+    global _active_timers
+
+    profile_path = getattr(args, 'profile', None)
+    trace_mem = getattr(args, 'trace_mem', False)
+    top = getattr(args, 'profile_top', DEFAULT_TOP)
+    if not profile_path and not trace_mem:
+        yield None
+        return
+
+    stream = stream or sys.stderr
+    timers = StageTimers()
+    profiler = cProfile.Profile() if profile_path else None
+
+    _active_timers = timers
+    if trace_mem:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    started = time.perf_counter()
+    try:
+        yield timers
+    finally:
+        wall = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+        snapshot = None
+        peak = 0
+        if trace_mem:
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        _active_timers = None
+
+        print(f"\n=== PROFILE ({name}) ===", file=stream)
+        print(f"Wall time: {wall:.4f}s", file=stream)
+        if timers.totals:
+            print("Stage timings (self time):", file=stream)
+            for line in timers.report():
+                print(line, file=stream)
+
+        if profiler is not None:
+            profiler.dump_stats(profile_path)
+            with open(f"{profile_path}.folded", 'w', encoding='utf-8') as f:
+                for line in timers.folded(name):
+                    f.write(line + '\n')
+            print(f"cProfile stats written to {profile_path}, stage stacks to {profile_path}.folded",
+                  file=stream)
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+
+        if snapshot is not None:
+            print(f"Peak traced memory: {peak / 1024:.1f} KiB", file=stream)
+            print("Top allocations:", file=stream)
+            for statistic in snapshot.statistics('lineno')[:top]:
+                frame = statistic.traceback[0]
+                print(f"  {frame.filename}:{frame.lineno}: {statistic.size / 1024:.1f} KiB "
+                      f"({statistic.count} blocks)", file=stream)
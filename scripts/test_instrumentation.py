@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared instrumentation helpers.
+"""
+
+import unittest
+import argparse
+import sys
+import os
+import tempfile
+from io import StringIO
+
+# Add the script directory to the path so we can import the module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Import the module under test
+import instrumentation
+from instrumentation import StageTimers, add_instrumentation_arguments, instrumented, stage
+
+
+class TestStageTimers(unittest.TestCase):
+    """Test cases for per-stage timing."""
+
+    def test_nested_stages_record_self_time(self):
+        """Test that nested stages are keyed by stack and excluded from the parent."""
+        timers = StageTimers()
+        with timers.stage('wait'):
+            with timers.stage('connect'):
+                pass
+            with timers.stage('connect'):
+                pass
+
+        self.assertEqual(set(timers.totals), {('wait',), ('wait', 'connect')})
+        self.assertEqual(timers.counts[('wait', 'connect')], 2)
+        self.assertGreaterEqual(timers.totals[('wait',)], 0.0)
+
+    def test_folded_output(self):
+        """Test that folded stacks are 'root;stage microseconds' lines."""
+        timers = StageTimers()
+        timers.totals[('walk',)] = 0.25
+        timers.counts[('walk',)] = 1
+
+        self.assertEqual(timers.folded('tool'), ['tool;walk 250000'])
+
+
+class TestInstrumented(unittest.TestCase):
+    """Test cases for the command-line instrumentation context."""
+
+    def parse(self, *argv):
+        parser = argparse.ArgumentParser()
+        add_instrumentation_arguments(parser)
+        return parser.parse_args(list(argv))
+
+    def test_stage_is_noop_when_disabled(self):
+        """Test that stage() records nothing without --profile or --trace-mem."""
+        with instrumented(self.parse(), 'tool') as timers:
+            with stage('walk'):
+                pass
+        self.assertIsNone(timers)
+        self.assertIsNone(instrumentation._active_timers)
+
+    def test_profile_and_trace_mem_reports(self):
+        """Test that --profile writes stats files and --trace-mem reports peak memory."""
+        with tempfile.TemporaryDirectory() as tmp:
+            profile_path = os.path.join(tmp, 'out.prof')
+            output = StringIO()
+
+            with instrumented(self.parse('--profile', profile_path, '--trace-mem'), 'tool', output):
+                with stage('walk'):
+                    [str(i) for i in range(1000)]
+
+            self.assertTrue(os.path.exists(profile_path))
+            with open(profile_path + '.folded', encoding='utf-8') as f:
+                self.assertTrue(f.read().startswith('tool;walk '))
+
+        report = output.getvalue()
+        self.assertIn('=== PROFILE (tool) ===', report)
+        self.assertIn('Peak traced memory:', report)
+        self.assertIsNone(instrumentation._active_timers)
+
+
+if __name__ == '__main__':
+    # Configure test runner
+    unittest.main(verbosity=2, buffer=True)
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Test suite for the add_license_headers.py script.
+"""
+
+import unittest
+import json
+import sys
+import os
+import time
+import tempfile
+import warnings
+import xml.etree.ElementTree as ET
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the script directory to the path so we can import the module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Import the module under test
+import add_license_headers
+from add_license_headers import (
+    DEFAULT_COPYRIGHT,
+    GitIgnoreMatcher,
+    LicenseHeaderWatcher,
+    add_license_header,
+    compile_gitignore_line,
+    find_license_header,
+    find_source_files,
+    main,
+    render_license_header,
+    run_pipeline,
+    update_license_header,
+)
+
+
+def write_file(path: Path, content: str = '') -> Path:
+    """Create a file and any missing parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+class ListedDirectory:
+    """Stand-in for an os.scandir iterator over entries that were already listed."""
+
+    def __init__(self, entries):
+        self._entries = iter(entries)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        pass
+
+
+class TestGitIgnoreMatcher(unittest.TestCase):
+    """Test cases for .gitignore parsing and matching."""
+
+    def setUp(self):
+        """Create a temporary tree for each test."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        """Remove the temporary tree."""
+        self.tmp.cleanup()
+
+    def test_blank_and_comment_lines_are_ignored(self):
+        """Test that blank lines and comments produce no rule."""
+        self.assertIsNone(compile_gitignore_line('\n'))
+        self.assertIsNone(compile_gitignore_line('# comment\n'))
+        self.assertIsNotNone(compile_gitignore_line('\\#literal\n'))
+
+    def test_unanchored_pattern_matches_at_any_depth(self):
+        """Test that a pattern without a slash matches basenames anywhere."""
+        write_file(self.root / '.gitignore', '*.log\n')
+        matcher = GitIgnoreMatcher(self.root)
+        matcher.load(self.root)
+
+        self.assertTrue(matcher.is_ignored(self.root / 'debug.log'))
+        self.assertTrue(matcher.is_ignored(self.root / 'a' / 'b' / 'debug.log'))
+        self.assertFalse(matcher.is_ignored(self.root / 'debug.ts'))
+
+    def test_anchored_and_directory_only_patterns(self):
+        """Test leading-slash anchoring and trailing-slash directory rules."""
+        write_file(self.root / '.gitignore', '/out\ncoverage/\n')
+        matcher = GitIgnoreMatcher(self.root)
+        matcher.load(self.root)
+
+        self.assertTrue(matcher.is_ignored(self.root / 'out', is_dir=True))
+        self.assertFalse(matcher.is_ignored(self.root / 'src' / 'out', is_dir=True))
+        self.assertTrue(matcher.is_ignored(self.root / 'pkg' / 'coverage', is_dir=True))
+        self.assertFalse(matcher.is_ignored(self.root / 'coverage'))
+
+    def test_double_star_and_negation(self):
+        """Test '**' globs and that a later negation re-includes a path."""
+        write_file(self.root / '.gitignore', 'gen/**/*.js\n!gen/**/keep.js\n')
+        matcher = GitIgnoreMatcher(self.root)
+        matcher.load(self.root)
+
+        self.assertTrue(matcher.is_ignored(self.root / 'gen' / 'a.js'))
+        self.assertTrue(matcher.is_ignored(self.root / 'gen' / 'x' / 'y' / 'a.js'))
+        self.assertFalse(matcher.is_ignored(self.root / 'gen' / 'x' / 'keep.js'))
+
+    def test_last_matching_rule_wins_for_files_and_directories(self):
+        """Test that directory-only rules are skipped for files without breaking rule order."""
+        write_file(self.root / '.gitignore', '*.ts\n!keep.ts\nkeep.ts/\n')
+        matcher = GitIgnoreMatcher(self.root)
+        matcher.load(self.root)
+
+        self.assertTrue(matcher.is_ignored(self.root / 'a.ts'))
+        self.assertFalse(matcher.is_ignored(self.root / 'src' / 'keep.ts'))
+        self.assertTrue(matcher.is_ignored(self.root / 'src' / 'keep.ts', is_dir=True))
+        self.assertTrue(matcher.is_ignored(self.root / 'a.ts', rel_path='a.ts'))
+
+    def test_nested_gitignore_is_scoped_and_overrides(self):
+        """Test that nested .gitignore rules apply only below their directory."""
+        write_file(self.root / '.gitignore', '*.gen.ts\n')
+        write_file(self.root / 'pkg' / '.gitignore', '/local.ts\n!keep.gen.ts\n')
+        matcher = GitIgnoreMatcher(self.root)
+        matcher.load(self.root)
+        matcher.load(self.root / 'pkg')
+
+        self.assertTrue(matcher.is_ignored(self.root / 'pkg' / 'local.ts'))
+        self.assertFalse(matcher.is_ignored(self.root / 'local.ts'))
+        self.assertFalse(matcher.is_ignored(self.root / 'pkg' / 'keep.gen.ts'))
+        self.assertTrue(matcher.is_ignored(self.root / 'keep.gen.ts'))
+
+
+    def test_bracket_expressions(self):
+        """Test literal ']' and '[' members, ranges and negation inside a class."""
+        write_file(self.root / '.gitignore', '[]x].ts\n[[]y.ts\n[!a-c]z.ts\n')
+        matcher = GitIgnoreMatcher(self.root)
+        matcher.load(self.root)
+
+        self.assertTrue(matcher.is_ignored(self.root / '].ts'))
+        self.assertTrue(matcher.is_ignored(self.root / 'x.ts'))
+        self.assertTrue(matcher.is_ignored(self.root / '[y.ts'))
+        self.assertTrue(matcher.is_ignored(self.root / 'dz.ts'))
+        self.assertFalse(matcher.is_ignored(self.root / 'az.ts'))
+
+    def test_malformed_pattern_matches_nothing(self):
+        """Test that an uncompilable line is dropped without losing the other rules."""
+        write_file(self.root / '.gitignore', '[z-a].ts\n*.log\n')
+        matcher = GitIgnoreMatcher(self.root)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            matcher.load(self.root)
+
+        self.assertFalse(matcher.is_ignored(self.root / 'b.ts'))
+        self.assertTrue(matcher.is_ignored(self.root / 'debug.log'))
+
+
+class TestFindSourceFiles(unittest.TestCase):
+    """Test cases for walking the tree."""
+
+    def setUp(self):
+        """Create a small source tree with ignored and skipped content."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        write_file(self.root / '.gitignore', 'worktrees/\n*.generated.ts\n')
+        write_file(self.root / 'src' / 'index.ts', 'export {};\n')
+        write_file(self.root / 'src' / 'api.generated.ts', 'export {};\n')
+        write_file(self.root / 'src' / 'sub' / '.gitignore', 'scratch.py\n')
+        write_file(self.root / 'src' / 'sub' / 'scratch.py', 'pass\n')
+        write_file(self.root / 'src' / 'sub' / 'tool.py', 'pass\n')
+        write_file(self.root / 'worktrees' / 'agent' / 'copy.ts', 'export {};\n')
+        write_file(self.root / 'node_modules' / 'dep' / 'index.js', '')
+
+    def tearDown(self):
+        """Remove the temporary tree."""
+        self.tmp.cleanup()
+
+    def relative(self, files):
+        return [f.relative_to(self.root).as_posix() for f in files]
+
+    def test_gitignored_paths_are_skipped(self):
+        """Test that root and nested .gitignore rules prune the walk."""
+        files = self.relative(find_source_files(self.root))
+        self.assertEqual(files, ['src/index.ts', 'src/sub/tool.py'])
+
+    def test_gitignore_can_be_disabled(self):
+        """Test that use_gitignore=False falls back to the built-in skip rules only."""
+        files = self.relative(find_source_files(self.root, use_gitignore=False))
+        self.assertIn('src/api.generated.ts', files)
+        self.assertIn('src/sub/scratch.py', files)
+        self.assertIn('worktrees/agent/copy.ts', files)
+        self.assertNotIn('node_modules/dep/index.js', files)
+
+
+class TestRunPipeline(unittest.TestCase):
+    """Test cases for the streaming pipeline API."""
+
+    def setUp(self):
+        """Create a small tree with one licensed file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        add_license_header(write_file(self.root / 'src' / 'a.ts', 'export {};\n'))
+        write_file(self.root / 'src' / 'b.css', 'body {}\n')
+        write_file(self.root / 'lib' / 'c.py', 'pass\n')
+
+    def tearDown(self):
+        """Remove the temporary tree."""
+        self.tmp.cleanup()
+
+    def test_pipeline_is_lazy(self):
+        """Test that nothing is processed until results are consumed."""
+        results = run_pipeline(self.root, 'add')
+
+        self.assertEqual((self.root / 'src' / 'b.css').read_text(encoding='utf-8'), 'body {}\n')
+        first = next(results)
+        self.assertIsNotNone(first.changed)
+        results.close()
+
+    def test_pipeline_modes(self):
+        """Test check, dry-run add and add modes across jobs settings."""
+        checked = {r.path.name: r.changed for r in run_pipeline(self.root, 'check', jobs=2)}
+        self.assertEqual(checked, {'a.ts': False, 'b.css': True, 'c.py': True})
+
+        dry_run = {r.path.name: r.changed for r in run_pipeline(self.root, 'add', dry_run=True)}
+        self.assertEqual(dry_run, checked)
+
+        list(run_pipeline(self.root, 'add', jobs=3))
+        self.assertFalse(any(r.changed for r in run_pipeline(self.root, 'check')))
+
+    def test_unknown_mode_is_rejected(self):
+        """Test that an unknown mode raises ValueError."""
+        with self.assertRaises(ValueError):
+            run_pipeline(self.root, 'delete')
+
+
+class TestUpdateLicenseHeader(unittest.TestCase):
+    """Test cases for rewriting existing license headers."""
+
+    NOTICE = 'Copyright (c) 2025-2026 xDJs LLC'
+
+    def setUp(self):
+        """Create a temporary directory for each test."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def test_header_is_rewritten_in_place(self):
+        """Test that an added header is replaced and the body is preserved."""
+        path = write_file(self.root / 'index.ts', 'export const a = 1;\n')
+        add_license_header(path)
+
+        changed, _ = update_license_header(path, notice=self.NOTICE)
+
+        content = path.read_text(encoding='utf-8')
+        self.assertTrue(changed)
+        self.assertTrue(content.startswith('/**\n * Copyright (c) 2025-2026 xDJs LLC\n'))
+        self.assertTrue(content.endswith(' */\n\nexport const a = 1;\n'))
+        self.assertEqual(content.count('Copyright'), 1)
+
+    def test_crlf_line_endings_are_preserved(self):
+        """Test that a CRLF file keeps CRLF line endings in the rewritten header."""
+        path = self.root / 'index.ts'
+        old = render_license_header('js', DEFAULT_COPYRIGHT)
+        path.write_bytes((old + 'export const a = 1;\n').replace('\n', '\r\n').encode('utf-8'))
+
+        changed, _ = update_license_header(path, notice=self.NOTICE)
+        content = path.read_bytes().decode('utf-8')
+
+        self.assertTrue(changed)
+        self.assertIn(self.NOTICE, content)
+        self.assertNotIn('\n', content.replace('\r\n', ''))
+        changed, message = update_license_header(path, notice=self.NOTICE)
+        self.assertFalse(changed)
+        self.assertIn('up to date', message)
+
+    @unittest.skipUnless(hasattr(os, 'symlink') and hasattr(os, 'link'), "needs symlink and hard link support")
+    def test_symlinks_and_hard_links_are_kept(self):
+        """Test that updating through a symlink or a hard link rewrites the shared file."""
+        real = write_file(self.root / 'real' / 'a.ts', 'export const a = 1;\n')
+        add_license_header(real)
+        shared = write_file(self.root / 'b.ts', 'export const b = 1;\n')
+        add_license_header(shared)
+        link = self.root / 'link.ts'
+        link.symlink_to(real)
+        alias = self.root / 'alias.ts'
+        os.link(shared, alias)
+
+        self.assertTrue(update_license_header(link, notice=self.NOTICE)[0])
+        self.assertTrue(update_license_header(alias, notice=self.NOTICE)[0])
+
+        self.assertTrue(link.is_symlink())
+        self.assertIn(self.NOTICE, real.read_text(encoding='utf-8'))
+        self.assertTrue(os.path.samefile(shared, alias))
+        self.assertEqual(shared.read_text(encoding='utf-8').count('Copyright'), 1)
+        self.assertIn(self.NOTICE, shared.read_text(encoding='utf-8'))
+        self.assertEqual(list(self.root.glob('.*.ts.*')), [])
+
+    def test_shebang_is_kept(self):
+        """Test that shell scripts keep their own shebang line."""
+        path = write_file(self.root / 'run.sh', '#!/bin/sh\necho hi\n')
+        add_license_header(path)
+
+        update_license_header(path, notice=self.NOTICE)
+
+        lines = path.read_text(encoding='utf-8').split('\n')
+        self.assertEqual(lines[0], '#!/bin/sh')
+        self.assertEqual(lines[2], '# Copyright (c) 2025-2026 xDJs LLC')
+        self.assertEqual(lines[-2], 'echo hi')
+
+    def test_up_to_date_header_is_not_rewritten(self):
+        """Test that a current header is left untouched."""
+        path = write_file(self.root / 'query.sql', 'select 1;\n')
+        add_license_header(path)
+        before = path.stat().st_mtime_ns
+
+        changed, message = update_license_header(path)
+
+        self.assertFalse(changed)
+        self.assertIn('up to date', message)
+        self.assertEqual(path.stat().st_mtime_ns, before)
+
+    def test_missing_header_is_added(self):
+        """Test that files without a header get one with the new notice."""
+        path = write_file(self.root / 'page.html', '<p>hi</p>\n')
+
+        changed, _ = update_license_header(path, notice=self.NOTICE)
+
+        self.assertTrue(changed)
+        self.assertIn(self.NOTICE, path.read_text(encoding='utf-8'))
+
+    def test_docstring_mentioning_copyright_is_not_a_header(self):
+        """Test that a module docstring with other text is never replaced."""
+        lines = ['"""', 'Script to add license headers.', 'Copyright (c) 2025 xDJs LLC', '"""', '']
+        self.assertIsNone(find_license_header(lines, 'py'))
+
+
+class TestCheckMode(unittest.TestCase):
+    """Test cases for the read-only --check mode."""
+
+    def setUp(self):
+        """Create a tree with one licensed and two unlicensed files."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        add_license_header(write_file(self.root / 'a.ts', 'export {};\n'))
+        write_file(self.root / 'b.ts', 'export {};\n')
+        write_file(self.root / 'c.py', 'pass\n')
+
+    def tearDown(self):
+        """Remove the temporary tree."""
+        self.tmp.cleanup()
+
+    def run_main(self, *argv):
+        with patch('sys.stdout', new_callable=StringIO):
+            return main(['-d', str(self.root), *argv])
+
+    def test_check_reports_missing_without_writing(self):
+        """Test that --check fails, writes a JSON report and leaves files untouched."""
+        report = self.root / 'report.json'
+
+        exit_code = self.run_main('--check', '--report', str(report), '--jobs', '2', '--sort')
+
+        self.assertEqual(exit_code, 1)
+        data = json.loads(report.read_text(encoding='utf-8'))
+        self.assertEqual(data['checked'], 3)
+        self.assertEqual(data['missing'], ['b.ts', 'c.py'])
+        self.assertEqual((self.root / 'b.ts').read_text(encoding='utf-8'), 'export {};\n')
+
+    def test_check_fail_fast_stops_at_first_violation(self):
+        """Test that --fail-fast stops after the first offending file."""
+        report = self.root / 'report.json'
+
+        self.run_main('--check', '--fail-fast', '--report', str(report))
+
+        data = json.loads(report.read_text(encoding='utf-8'))
+        self.assertEqual(len(data['missing']), 1)
+        self.assertIn(data['missing'][0], ('b.ts', 'c.py'))
+
+    def test_check_fail_fast_with_sort_stops_early(self):
+        """Test that --sort only orders output, so --fail-fast still stops the scan."""
+        for n in range(20):
+            write_file(self.root / f'extra{n}.ts', 'export {};\n')
+
+        with patch('add_license_headers.check_license_header',
+                   wraps=add_license_headers.check_license_header) as check:
+            exit_code = self.run_main('--check', '--fail-fast', '--sort')
+
+        self.assertEqual(exit_code, 1)
+        self.assertLess(check.call_count, 23)
+
+    def test_check_junit_report(self):
+        """Test that the JUnit report has one failing testcase per offending file."""
+        report = self.root / 'report.xml'
+
+        self.run_main('--check', '--report', str(report), '--report-format', 'junit', '--sort')
+
+        suite = ET.parse(report).getroot().find('testsuite')
+        self.assertEqual(suite.get('failures'), '2')
+        self.assertEqual([case.get('name') for case in suite.iter('testcase')], ['b.ts', 'c.py'])
+
+    def test_check_passes_when_all_files_are_licensed(self):
+        """Test that --check exits 0 once every file has a header."""
+        self.run_main()
+        self.assertEqual(self.run_main('--check'), 0)
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "inotify is Linux only")
+class TestLicenseHeaderWatcher(unittest.TestCase):
+    """Test cases for the inotify watch mode."""
+
+    def setUp(self):
+        """Start a watcher on an empty tree."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        write_file(self.root / '.gitignore', 'ignored/\n')
+        self.watcher = LicenseHeaderWatcher(self.root, debounce=0)
+        self.watcher.start()
+
+    def tearDown(self):
+        """Stop the watcher and remove the tree."""
+        self.watcher.close()
+        self.tmp.cleanup()
+
+    def poll_until_idle(self):
+        results = []
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            batch = self.watcher.poll(0.05)
+            results.extend(batch)
+            if not batch and not self.watcher.pending and results:
+                break
+        return results
+
+    def test_idle_watcher_blocks(self):
+        """Test that nothing is pending and the watcher would block while idle."""
+        self.assertIsNone(self.watcher.next_timeout())
+        self.assertEqual(self.watcher.poll(0), [])
+
+    def test_new_files_get_headers(self):
+        """Test that created files and files in new directories are processed."""
+        new_file = write_file(self.root / 'index.ts', 'export {};\n')
+        nested_file = write_file(self.root / 'pkg' / 'deep' / 'util.py', 'pass\n')
+        write_file(self.root / 'ignored' / 'skip.ts', 'export {};\n')
+        write_file(self.root / 'notes.txt', 'hello\n')
+
+        processed = {path for path, changed, _ in self.poll_until_idle() if changed}
+
+        self.assertEqual(processed, {new_file, nested_file})
+        self.assertIn('Copyright (c) 2025 xDJs LLC', new_file.read_text(encoding='utf-8'))
+        self.assertIn('Copyright (c) 2025 xDJs LLC', nested_file.read_text(encoding='utf-8'))
+        self.assertEqual((self.root / 'ignored' / 'skip.ts').read_text(encoding='utf-8'), 'export {};\n')
+
+    def test_file_held_open_past_debounce_is_not_rewritten(self):
+        """Test that a file is only processed after its writer closes it."""
+        self.watcher.debounce = 0.2
+        path = self.root / 'slow.ts'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('export const a = 1;\n')
+            f.flush()
+            deadline = time.monotonic() + 0.6
+            while time.monotonic() < deadline:
+                self.assertEqual(self.watcher.poll(0.05), [])
+            f.write('export const b = 2;\n')
+
+        processed = [p for p, changed, _ in self.poll_until_idle() if changed]
+
+        self.assertEqual(processed, [path])
+        content = path.read_text(encoding='utf-8')
+        self.assertTrue(content.startswith('/**\n * Copyright (c) 2025 xDJs LLC\n'))
+        self.assertTrue(content.endswith(' */\n\nexport const a = 1;\nexport const b = 2;\n'))
+
+    def test_file_created_after_directory_listing_is_seen(self):
+        """Test that a file created right after a new directory is listed still gets a header."""
+        late = self.root / 'pkg' / 'a' / 'late.ts'
+        real_scandir = os.scandir
+
+        def scandir_then_write(path):
+            # Materialise the listing, then create a file the listing cannot contain
+            with real_scandir(path) as it:
+                entries = list(it)
+            if Path(path) == late.parent and not late.exists():
+                write_file(late, 'export {};\n')
+            return ListedDirectory(entries)
+
+        (self.root / 'pkg' / 'a').mkdir(parents=True)
+        with patch('os.scandir', scandir_then_write):
+            processed = [path for path, changed, _ in self.poll_until_idle() if changed]
+
+        self.assertEqual(processed, [late])
+        self.assertIn('Copyright (c) 2025 xDJs LLC', late.read_text(encoding='utf-8'))
+
+    def test_file_in_new_directory_waits_for_writer(self):
+        """Test that files found in a new directory are delayed while still open for writing."""
+        self.watcher.debounce = 0.1
+        path = self.root / 'pkg' / 'open.py'
+        path.parent.mkdir()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('a = 1\n')
+            f.flush()
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                self.assertEqual(self.watcher.poll(0.05), [])
+            f.write('b = 2\n')
+
+        processed = [p for p, changed, _ in self.poll_until_idle() if changed]
+
+        self.assertEqual(processed, [path])
+        self.assertTrue(path.read_text(encoding='utf-8').endswith('"""\n\na = 1\nb = 2\n'))
+
+    def test_watcher_honours_notice_and_update(self):
+        """Test that the copyright line and update mode reach the watcher."""
+        self.watcher.close()
+        self.watcher = LicenseHeaderWatcher(self.root, debounce=0, update=True,
+                                            notice='Copyright (c) 2025-2026 xDJs LLC')
+        self.watcher.start()
+        staged = self.root / 'staged.txt'
+        write_file(staged, 'export {};\n')
+        with patch('add_license_headers.FILE_EXTENSIONS', {'.txt': 'js', '.ts': 'js'}):
+            add_license_header(staged)
+        self.assertEqual(self.watcher.poll(0.05), [])
+        target = self.root / 'index.ts'
+        staged.rename(target)
+
+        processed = [path for path, changed, _ in self.poll_until_idle() if changed]
+
+        self.assertEqual(processed, [target])
+        content = target.read_text(encoding='utf-8')
+        self.assertIn('Copyright (c) 2025-2026 xDJs LLC', content)
+        self.assertEqual(content.count('Copyright'), 1)
+
+    def test_watch_rejects_check_options(self):
+        """Test that --watch refuses the one-off scan reporting options."""
+        with patch('sys.stderr', new_callable=StringIO), self.assertRaises(SystemExit):
+            main(['-d', str(self.root), '--watch', '--check'])
+
+    def test_renamed_files_get_headers(self):
+        """Test that a file renamed to a source extension is processed."""
+        draft = write_file(self.root / 'draft.txt', 'body {}\n')
+        self.assertEqual(self.watcher.poll(0.05), [])
+        target = self.root / 'style.css'
+        draft.rename(target)
+
+        processed = [path for path, changed, _ in self.poll_until_idle() if changed]
+
+        self.assertEqual(processed, [target])
+
+
+if __name__ == '__main__':
+    # Configure test runner
+    unittest.main(verbosity=2, buffer=True)